@@ -3,15 +3,15 @@ from concurrent.futures import as_completed, ThreadPoolExecutor
 from datetime import timedelta
 from itertools import chain
 import logging
-from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Iterable, Optional, Set, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 from rich.console import Console
+from rich.text import Text
 
-from .printers import IDLE_STATES, Printer
+from .printers import IDLE_STATES, MissingOrStaleFile, Printer
 from .utilities import (
-    gen_files_from_path,
+    gen_files_and_mtimes_from_path,
     human_readable_transfer_speed,
     strfdelta,
 )
@@ -20,16 +20,25 @@ console = Console(highlight=False)
 
 __VERSION__ = "0.2.5"
 
+# The maximum number of printers to be synchronized at the same time.
+MAX_WORKERS = 64
+
 
 logger = logging.getLogger(__name__)
 
 
+def _as_resolved_path(path: Union[Path, str]) -> Path:
+    """Return the given `path` as an absolute Path with `~` expanded."""
+    return Path(path).expanduser().resolve()
+
+
 def _sync(
     *,
     printer: Printer,
     local_files: Iterable[Path],
     relative_to_path: Path,
     destination_path: Path,
+    local_mtimes: Optional[Dict[Path, float]] = None,
     ignore_state: bool = False,
     execute: bool = False,
 ) -> Printer:
@@ -53,6 +62,9 @@ def _sync(
         The printer path to sync against.
     relative_to_path : Path
         If provided, prunes the local_file paths to this parent path.
+    local_mtimes : dict of Path to float or None, default None
+        Optional. Pre-computed modification times of the `local_files`, so
+        that they are not `stat()`'d once per printer.
     ignore_state : bool, default False
         If True, all printers, including those printing will be considered for
         file operations.
@@ -75,62 +87,89 @@ def _sync(
         destination_path=destination_path,
         relative_to_path=relative_to_path,
     )
-    missing_files = set(
+    missing_files: List[MissingOrStaleFile] = list(
         printer.gen_missing_or_stale_files(
             local_files=local_files,
             destination_path=destination_path,
             relative_to_path=relative_to_path,
+            local_mtimes=local_mtimes,
         )
     )
 
     # Print out what we're going to do (if `execute==True`)
     num_excess = len(excess_files)
-    num_upload = len([f for f in missing_files if f.is_stale is False])
-    num_stale = len([f for f in missing_files if f.is_stale is True])
+    num_stale = sum(1 for f in missing_files if f.is_stale)
+    num_upload = len(missing_files) - num_stale
     verb = "is" if num_excess == 1 else "are"
     plural_excess = "s" if num_excess != 1 else ""
     plural_stale = "s" if num_stale != 1 else ""
-    console.print(
-        f"[bold]{printer.name}[/bold] - There {verb} [bold]{num_excess} file"
-        f"{plural_excess} to delete[/bold], [bold]{num_upload} missing to "
-        f"upload[/bold] and [bold]{num_stale} stale file{plural_stale} to "
-        f"refresh[/bold]."
-    )
+    # The plan is written with a single call so that it is not interleaved
+    # with other printers' output, and the console lock is taken only once.
+    # The per-file lines are assembled as styled Text rather than markup so
+    # that they skip the markup parser (and any "[" in a path is literal).
+    lines = [
+        Text.from_markup(
+            f"[bold]{printer.name}[/bold] - There {verb} [bold]{num_excess} "
+            f"file{plural_excess} to delete[/bold], [bold]{num_upload} "
+            f"missing to upload[/bold] and [bold]{num_stale} stale "
+            f"file{plural_stale} to refresh[/bold]."
+        )
+    ]
     for missing in missing_files:
-        console.print(
-            f"To be [bold]{'refreshed' if missing.is_stale else 'uploaded'}"
-            f"[/bold] to [bold]{printer.name}[/bold]: [magenta]"
-            f"{missing.local_path}[/magenta] => [magenta]"
-            f"{missing.remote_path}[/magenta].",
+        lines.append(
+            Text.assemble(
+                "To be ",
+                ("refreshed" if missing.is_stale else "uploaded", "bold"),
+                " to ",
+                (printer.name, "bold"),
+                ": ",
+                (str(missing.local_path), "magenta"),
+                " => ",
+                (str(missing.remote_path), "magenta"),
+                ".",
+            )
         )
     for excess in excess_files:
-        console.print(
-            f"To be [bold]deleted[/bold] from [bold]{printer.name}[/bold]: "
-            f"[magenta]{excess}[/magenta].",
+        lines.append(
+            Text.assemble(
+                "To be ",
+                ("deleted", "bold"),
+                " from ",
+                (printer.name, "bold"),
+                ": ",
+                (str(excess), "magenta"),
+                ".",
+            )
         )
-    if not execute:
+    console.print(Text("\n").join(lines))
+    # When already in sync, there is nothing to do, and no need to re-fetch
+    # the printer's file listing afterwards.
+    if not execute or not (excess_files or missing_files):
         return printer
 
     # Prune Excess Files
+    excess_nodes = {}
     for excess_path in excess_files:
         if node := printer.storage.get_node_for_display_path(excess_path):
-            if printer.storage.delete_file(node).success:
-                console.print(
-                    f"File [magenta]{excess_path}[/magenta] [green]"
-                    f"successfully [bold]deleted[/bold][/green] from printer: "
-                    f"[bold]{printer.name}[/bold].",
-                )
-            else:
-                console.print(
-                    f"File [magenta]{excess_path}[/magenta] [red]failed to be "
-                    f"deleted[/red] from printer: [bold]{printer.name}"
-                    f"[/bold].",
-                )
+            excess_nodes[node] = excess_path
         else:
             console.print(
                 f'File "[magenta]{excess_path}[/magenta] [yellow]does not '
                 f"exist[/yellow] on printer: [bold]{printer.name}[/bold]",
             )
+    for node, response in printer.storage.delete_files(excess_nodes):
+        excess_path = excess_nodes[node]
+        if response.success:
+            console.print(
+                f"File [magenta]{excess_path}[/magenta] [green]"
+                f"successfully [bold]deleted[/bold][/green] from printer: "
+                f"[bold]{printer.name}[/bold].",
+            )
+        else:
+            console.print(
+                f"File [magenta]{excess_path}[/magenta] [red]failed to be "
+                f"deleted[/red] from printer: [bold]{printer.name}[/bold].",
+            )
 
     # Upload Missing Files
     for missing in missing_files:
@@ -221,23 +260,21 @@ def process(
         True on successful completion.
     """
     # Convert any given strings to Path instances.
-    if not isinstance(source_path, Path):
-        source_path = Path(source_path)
-    source_path = source_path.expanduser().resolve()
+    source_path = _as_resolved_path(source_path)
+    if not source_path.is_dir():
+        # Syncing an empty source would mark every remote file as excess.
+        console.print(
+            f"[red]Source path [magenta]{source_path}[/magenta] is not a "
+            "directory.[/red]"
+        )
+        return False
 
     if relative_to_path:
-        if isinstance(relative_to_path, Path):
-            relative_to_path = relative_to_path.expanduser().resolve()
-        else:
-            relative_to_path = Path(relative_to_path).expanduser().resolve()
+        relative_to_path = _as_resolved_path(relative_to_path)
     else:
         relative_to_path = source_path
 
-    if destination_path:
-        if not isinstance(destination_path, Path):
-            destination_path = Path(destination_path)
-    else:
-        destination_path = Path("")
+    destination_path = Path(destination_path or "")
 
     if config_path and not isinstance(config_path, Path):
         config_path = Path(config_path)
@@ -249,23 +286,30 @@ def process(
 
     if included_printers:
         # Flatten and nested iterables and lower-case the strings.
-        included_printers = set(map(str.lower, set(chain(*included_printers))))
+        included_names = set(
+            map(str.lower, chain.from_iterable(included_printers))
+        )
         printers = {
-            p for p in all_printers if p.name.lower() in included_printers
+            p for p in all_printers if p.name.lower() in included_names
         }
     elif excluded_printers:
         # Flatten and nested iterables and lower-case the strings.
-        excluded_printers = set(map(str.lower, set(chain(*excluded_printers))))
+        excluded_names = set(
+            map(str.lower, chain.from_iterable(excluded_printers))
+        )
         printers = {
-            p for p in all_printers if p.name.lower() not in excluded_printers
+            p for p in all_printers if p.name.lower() not in excluded_names
         }
     else:
         printers = all_printers
 
-    source_path = source_path.expanduser().resolve()
-    local_files = set(
-        gen_files_from_path(local_path=Path(source_path), suffixes=suffixes)
+    # Stat each local file once here rather than once per printer.
+    local_mtimes = dict(
+        gen_files_and_mtimes_from_path(
+            local_path=source_path, suffixes=suffixes
+        )
     )
+    local_files = set(local_mtimes)
 
     if execute:
         console.print("The following actions will be taken.")
@@ -277,7 +321,12 @@ def process(
         )
 
     try:
-        with ThreadPoolExecutor(max_workers=cpu_count()) as pool:
+        # The work is network-bound, so size the pool by the number of
+        # printers rather than the number of local CPUs.
+        max_workers = max(1, min(MAX_WORKERS, len(printers)))
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="link-sync"
+        ) as pool:
             futures = {
                 pool.submit(
                     _sync,
@@ -286,6 +335,7 @@ def process(
                     execute=execute,
                     ignore_state=ignore_state,
                     local_files=local_files,
+                    local_mtimes=local_mtimes,
                     relative_to_path=relative_to_path,
                 )
                 for printer in printers
@@ -6,11 +6,17 @@ from typing import Any, Dict, Optional, Union
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
+from urllib3.util.retry import Retry
 
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for each printer's cached `requests.Session`.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
 
 class ApiException(Exception):
     """An API-specific exception."""
@@ -59,7 +65,8 @@ class AbstractApi(metaclass=ABCMeta):
         self.username = username
         self.password = password
         self._api_base = f"{self.host}/api/v1"
-        self._session = None
+        self._auth: Optional[HTTPDigestAuth] = None
+        self._session: Optional[requests.Session] = None
 
     @abstractmethod
     def status_response(self, method="GET") -> ApiResponse:
@@ -81,14 +88,37 @@ class PrusaLinkApi(AbstractApi):
     """Implement the API for PrusaLink."""
 
     @property
-    def auth(self):
-        """Prepare and return an HTTPDigestAuth instance."""
-        return HTTPDigestAuth(username=self.username, password=self.password)
+    def auth(self) -> HTTPDigestAuth:
+        """Return a lazy-instantiated, cached HTTPDigestAuth instance."""
+        # Re-using the same instance allows the digest nonce to be re-used
+        # across requests, avoiding a 401 challenge on every request.
+        if self._auth is None:
+            self._auth = HTTPDigestAuth(
+                username=self.username, password=self.password
+            )
+        return self._auth
 
     @property
     def session(self) -> requests.Session:
         """Manage a lazy-instantiated, cached session instance."""
-        return requests.Session()
+        if self._session is None:
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                # Only retry idempotent reads; uploads stream a file object
+                # which cannot be safely re-sent.
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.2,
+                    allowed_methods=frozenset({"GET", "HEAD"}),
+                ),
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Connection"] = "keep-alive"
+            self._session = session
+        return self._session
 
     def status_response(self, method: str = "GET") -> ApiResponse:
         """Return the deserialized status API and payload."""
@@ -116,7 +146,7 @@ class PrusaLinkApi(AbstractApi):
         if not headers:
             headers = {}
         url = f"{self._api_base}/files{quote(str(path))}"
-        options = {}
+        options: Dict[str, Any] = {}
 
         if headers:
             options["headers"] = headers
@@ -3,11 +3,17 @@ from enum import auto, Enum
 import json
 import logging
 from pathlib import Path
-from typing import Generator, Iterable, List, Set, Union
+from typing import Generator, Iterable, List, Mapping, Optional, Set, Union
 
 import yaml
 
-from .storage import FileNode, Storage
+from .storage import Storage
+
+try:
+    # Prefer the libyaml-backed loader, where available.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
 
 
 logger = logging.getLogger(__name__)
@@ -30,7 +36,10 @@ class State(Enum):
 
 
 # It should be safe to interact with the printer's API while in these states.
-IDLE_STATES = {State.FINISHED, State.IDLE, State.READY}
+IDLE_STATES = frozenset({State.FINISHED, State.IDLE, State.READY})
+
+# A remote file is stale if the local file is newer than it by more than this.
+STALE_THRESHOLD = timedelta(seconds=60)
 
 
 class MissingOrStaleFile:
@@ -110,7 +119,7 @@ class Printer:
                 if config_file_path.suffix.lower() in json_suffixes:
                     printer_list = json.load(config_file)
                 elif config_file_path.suffix.lower() in yaml_suffixes:
-                    printer_list = yaml.safe_load(config_file)
+                    printer_list = yaml.load(config_file, Loader=SafeLoader)
                 else:
                     raise PrinterException(
                         "Only JSON and YAML configuration files are supported."
@@ -171,6 +180,7 @@ class Printer:
         destination_path: Path,
         local_files: Iterable[Path],
         relative_to_path: Path,
+        local_mtimes: Optional[Mapping[Path, float]] = None,
     ) -> Generator[MissingOrStaleFile, None, None]:
         """
         Yield local files that are not present on the printer.
@@ -187,33 +197,36 @@ class Printer:
             An iterable of Path instances representing the local files.
         relative_to_path : Path
             Prunes the local_file paths to this parent path.
+        local_mtimes : Mapping of Path to float or None, default None
+            Optional. Pre-computed modification times of the `local_files`.
+            Any file not found here will be `stat()`'d instead.
 
         Yields
         ------
         MissingOrStaleFile
             Information about the missing or stale file.
         """
+        if destination_path:
+            remote_root = Path(
+                self.storage.root_node.full_display_path, destination_path
+            )
+        else:
+            remote_root = Path(self.storage.root_node.full_display_path)
+
         for local_file in local_files:
             relative_file = local_file.relative_to(relative_to_path)
-            if destination_path:
-                remote_path = Path(
-                    self.storage.root_node.full_display_path,
-                    destination_path,
-                    relative_file,
-                )
-            else:
-                remote_path = Path(
-                    self.storage.root_node.full_display_path, relative_file
-                )
+            remote_path = remote_root / relative_file
             if node := self.storage.get_node_for_display_path(remote_path):
                 # Looks like the file already exists, check if it is stale.
                 # Stale requires that the remote_file be more than 60 seconds
                 # older than the local file.
-                local_mt = datetime.fromtimestamp(
-                    local_file.stat().st_mtime, tz=timezone.utc
-                )
+                if local_mtimes and local_file in local_mtimes:
+                    local_ts = local_mtimes[local_file]
+                else:
+                    local_ts = local_file.stat().st_mtime
+                local_mt = datetime.fromtimestamp(local_ts, tz=timezone.utc)
                 if node_mt := node.m_datetime:
-                    if local_mt > node_mt + timedelta(seconds=60):
+                    if local_mt > node_mt + STALE_THRESHOLD:
                         yield MissingOrStaleFile(
                             local_path=local_file,
                             remote_path=remote_path,
@@ -261,32 +274,20 @@ class Printer:
             )
 
         if dest_node := self.storage.get_node_for_display_path(dest_node_path):
-            # Start with all the nodes (as their full_display_names).
+            # Start with all the nodes beneath the destination (as their
+            # full_display_names).
             excess_nodes = set(
                 node.full_display_path
-                for node in self.storage.gen_nodes()
-                if (
-                    node.full_short_path.startswith(dest_node.full_short_path)
-                    and not node.is_dir
-                )
+                for node in self.storage.gen_nodes(dest_node)
+                if not node.is_dir
             )
         else:
             return set()
 
-        # Build the set of nodes that represent local_files.
-        remote_nodes: Set[FileNode] = set()
-        for local_file in local_files:
-            relative_file = local_file.relative_to(relative_to_path)
-            remote_path = Path(destination_path, relative_file)
-            if node := self.storage.get_node_for_display_path(remote_path):
-                remote_nodes.add(node)
-
-        # Eliminate the remote_nodes that represent local files.
-        for node in remote_nodes:
-            try:
-                excess_nodes.remove(node.full_display_path)
-            except KeyError:
-                pass
+        # Eliminate the paths that represent local files.
+        excess_nodes.difference_update(
+            str(Path(destination_path, f.relative_to(relative_to_path)))
+            for f in local_files
+        )
 
-        # Return remaining nodes as tuples of short and display Paths.
         return {Path(node) for node in excess_nodes}
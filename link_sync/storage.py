@@ -1,8 +1,22 @@
+from concurrent.futures import (
+    as_completed,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime, timedelta, timezone
-from functools import cached_property
 import logging
 from pathlib import Path
-from typing import Generator, Optional, Set, Union
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from .apis import ApiException, PrusaLinkApi
 from .utilities import Timer
@@ -10,6 +24,20 @@ from .utilities import Timer
 
 logger = logging.getLogger(__name__)
 
+# The maximum number of concurrent requests made to a single printer when
+# listing folders or deleting files.
+REQUEST_WORKERS = 4
+
+# Uploads are streamed from disk through a buffer of this many bytes.
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Headers sent with every upload, and the Content-type for known suffixes.
+UPLOAD_HEADERS = {"Overwrite": "true", "Print-After-Upload": "false"}
+UPLOAD_CONTENT_TYPES = {
+    ".gcode": "text/x.gcode",
+    ".bbf": "application/octet-stream",
+}
+
 
 class StorageException(Exception):
     """An exception for storage API related issues."""
@@ -35,9 +63,24 @@ class FileNode:
     parent_node : FileNode or None
         Optional. The parent FileNode instance to this file or folder.
     kwargs : Mapping
-        Any other keyword arguments passed.
+        Any other keyword arguments passed. These are accepted so that API
+        payloads can be passed in directly, but are not retained.
     """
 
+    # There is one of these per remote file, so keep them lightweight.
+    __slots__ = (
+        "name",
+        "ro",
+        "type",
+        "m_timestamp",
+        "display_name",
+        "is_dir",
+        "child_nodes",
+        "parent_node",
+        "full_short_path",
+        "full_display_path",
+    )
+
     def __init__(
         self,
         *,
@@ -52,15 +95,28 @@ class FileNode:
         self.name = name  # 8.3 "short" name
         self.ro = ro
         self.type = type
+        self.is_dir = type == "FOLDER"
         self.m_timestamp = m_timestamp
         self.display_name = display_name
 
-        self._kwargs = kwargs
-        self._short_name: Optional[str] = None
-
-        self.child_nodes: Set = set()
+        # Keyed by the child's 8.3 "short" name.
+        self.child_nodes: Dict[str, "FileNode"] = {}
         self.parent_node = parent_node
 
+        # Nodes are always created after their parents, so the full paths can
+        # be composed from the parent's, rather than walking up the tree.
+        self.full_short_path: str
+        self.full_display_path: str
+        if parent_node:
+            self.full_short_path = f"{parent_node.full_short_path}/{name}"
+            self.full_display_path = (
+                f"{parent_node.full_display_path}/{display_name or name}"
+            )
+        else:
+            self.full_short_path = f"/{name}"
+            # Root nodes may not have display_names.
+            self.full_display_path = f"/{display_name or name}"
+
     def __str__(self) -> str:
         """Return a human-consumable instance representation."""
         return f'File: "{self.display_name or self.name}"'
@@ -69,42 +125,18 @@ class FileNode:
         """Return a instance representation."""
         return f"<{self.__str__()}>"
 
-    @cached_property
-    def is_dir(self):
-        """Return True if this node is a FOLDER."""
-        return self.type == "FOLDER"
-
-    @cached_property
-    def full_short_path(self):
-        """Return the path composed of 8.3 "short" components."""
-        if self.parent_node:
-            return f"{self.parent_node.full_short_path}/{self.name}"
-        else:
-            return f"/{self.name}"
-
-    @cached_property
-    def full_display_path(self):
-        """Return the full display path of the node."""
-        if self.parent_node:
-            return (
-                f"{self.parent_node.full_display_path}/"
-                f"{self.display_name or self.name}"
-            )
-        else:
-            # Root nodes may not have display_names.
-            return f"/{self.display_name or self.name}"
-
-    @cached_property
+    @property
     def m_datetime(self) -> Union[datetime, None]:
         """Return the modificiation date of the file as a datetime."""
         if self.m_timestamp:
-            return datetime.utcfromtimestamp(self.m_timestamp).astimezone(
-                tz=timezone.utc
-            )
+            return datetime.fromtimestamp(self.m_timestamp, tz=timezone.utc)
         else:
             return None
 
 
+NodeIndex = Dict[str, FileNode]
+
+
 class OperationResponse:
     """Thin, slotted class to hold operation results."""
 
@@ -145,6 +177,12 @@ class Storage:
         self.api = PrusaLinkApi(
             name=self.name, host=host, username=username, password=password
         )
+        # Folders created since the last (re)load, so that uploading several
+        # files into a new folder only requests its creation once.
+        self._created_folders: Set[Path] = set()
+        # Lazily-built mappings of `full_display_path` and `full_short_path`
+        # to FileNode. See `_get_indexes()`.
+        self._indexes: Optional[Tuple[NodeIndex, NodeIndex]] = None
         self.root_node = self._get_root_node()
         self._build_storage(self.root_node)
 
@@ -185,31 +223,68 @@ class Storage:
 
     def reload(self):
         """Rebuilds the storage node network."""
-        self.root_node.child_nodes = set()
+        self.root_node.child_nodes = {}
+        self._created_folders = set()
+        self._indexes = None
         self._build_storage(self.root_node)
 
     def _build_storage(self, file_obj: FileNode):
         """
-        Given a FileNode, recursively build a storage tree.
+        Given a FileNode, build the storage tree beneath it.
 
-        This is a recursive method which ultimately constructs a tree of
-        FileNodes from the remote device together as a network.
+        Each folder requires its own API request, so rather than recursing,
+        the folders are requested concurrently as they are discovered. The
+        responses are all handled here, in the calling thread, so the node
+        graph itself is only ever modified by one thread.
 
         Parameters
         ----------
         file_obj : FileNode
-            The FileNode currently being traversed.
+            The FileNode at the top of the tree to build.
+        """
+        # The node graph is changing, so any existing indexes are now invalid.
+        self._indexes = None
+        pending: Dict[Future, FileNode] = {}
+        with ThreadPoolExecutor(
+            max_workers=REQUEST_WORKERS,
+            thread_name_prefix=f"link-sync-{self.name}",
+        ) as pool:
+
+            def submit(folder_obj: FileNode):
+                future = pool.submit(
+                    self.api.files_response, path=folder_obj.full_short_path
+                )
+                pending[future] = folder_obj
+
+            submit(file_obj)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder_obj = pending.pop(future)
+                    response = future.result()
+                    if response.success and isinstance(response.payload, dict):
+                        for child_map in response.payload.get("children", []):
+                            child_obj = FileNode(
+                                **child_map, parent_node=folder_obj
+                            )
+                            folder_obj.child_nodes[child_obj.name] = child_obj
+                            if child_obj.type == "FOLDER":
+                                submit(child_obj)
+
+    def _get_indexes(self) -> Tuple[NodeIndex, NodeIndex]:
         """
-        short_path = file_obj.full_short_path
-        response = self.api.files_response(path=short_path)
+        Return the FileNodes indexed by full display path and full short path.
 
-        # If it has children, recurse...
-        if response.success and isinstance(response.payload, dict):
-            for child_map in response.payload.get("children", []):
-                child_obj = FileNode(**child_map, parent_node=file_obj)
-                file_obj.child_nodes.add(child_obj)
-                if child_obj.type == "FOLDER":
-                    self._build_storage(file_obj=child_obj)
+        The indexes are built on first use after the node graph changes.
+        """
+        if self._indexes is None:
+            display_index: NodeIndex = {}
+            short_index: NodeIndex = {}
+            for file_node in self.gen_nodes():
+                display_index[file_node.full_display_path] = file_node
+                short_index[file_node.full_short_path] = file_node
+            self._indexes = display_index, short_index
+        return self._indexes
 
     def gen_nodes(
         self, file_node: Optional[FileNode] = None
@@ -217,8 +292,8 @@ class Storage:
         """
         Yield all FileNode instances.
 
-        This works by starting from the `root_obj` and recursively traversing
-        any nodes' `child_objs` sets.
+        This works by starting from the `root_obj` and traversing any nodes'
+        `child_nodes`, depth-first.
 
         Parameters
         ----------
@@ -233,10 +308,14 @@ class Storage:
         if file_node is None:
             file_node = self.root_node
 
-        yield file_node
-
-        for child_node in file_node.child_nodes:
-            yield from self.gen_nodes(child_node)
+        # Walk the tree depth-first with an explicit stack, rather than with
+        # a recursive generator per node. Children are pushed in reverse so
+        # that they are yielded in their original order.
+        stack = [file_node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.child_nodes.values()))
 
     def get_node_for_display_path(
         self, path: Union[Path, str]
@@ -256,12 +335,8 @@ class Storage:
             If an object is found that represents the given path, it is
             returned, otherwise `None` is returned.
         """
-        if isinstance(path, Path):
-            path = str(path)
-        for file_node in self.gen_nodes():
-            if file_node.full_display_path == path:
-                return file_node
-        return None
+        display_index, _ = self._get_indexes()
+        return display_index.get(str(path))
 
     def get_node_for_short_path(
         self, path: Union[Path, str]
@@ -281,12 +356,8 @@ class Storage:
             If an object is found that represents the given path, it is
             returned, otherwise `None` is returned.
         """
-        if isinstance(path, Path):
-            path = str(path)
-        for file_node in self.gen_nodes():
-            if file_node.full_short_path == path:
-                return file_node
-        return None
+        _, short_index = self._get_indexes()
+        return short_index.get(str(path))
 
     def get_shorter_path(self, remote_path: Union[Path, str]) -> Path:
         """
@@ -306,11 +377,10 @@ class Storage:
             remote_path = Path(remote_path)
 
         for parent in remote_path.parents:
-            for node in self.gen_nodes():
-                if node.full_display_path == str(parent):
-                    return Path(node.full_short_path).joinpath(
-                        remote_path.relative_to(parent)
-                    )
+            if node := self.get_node_for_display_path(parent):
+                return Path(node.full_short_path).joinpath(
+                    remote_path.relative_to(parent)
+                )
 
         # Looks like this is a completely new path...
         return remote_path
@@ -379,27 +449,26 @@ class Storage:
             parent_path = shorter_path
 
         # If the parent folder doesn't exist, create it first.
-        if not self.get_node_for_short_path(parent_path):
+        if parent_path not in self._created_folders and (
+            not self.get_node_for_short_path(parent_path)
+        ):
             try:
-                self.create_remote_folder(parent_path)
+                if self.create_remote_folder(parent_path):
+                    self._created_folders.add(parent_path)
             except ApiException as e:
                 logger.error(str(e))
             except Exception:
                 logger.error("Folder already exists?")
 
-        headers = {
-            "Overwrite": "true",
-            "Print-After-Upload": "false",
-            "X-Api-Key": self.api_key,
-        }
-        if local_path.suffix == ".gcode":
-            headers.update({"Content-type": "text/x.gcode"})
-        elif local_path.suffix == ".bbf":
-            headers.update({"Content-type": "application/octet-stream"})
+        headers = {**UPLOAD_HEADERS, "X-Api-Key": self.api_key}
+        if content_type := UPLOAD_CONTENT_TYPES.get(local_path.suffix):
+            headers["Content-type"] = content_type
 
         with Timer() as timer:
             try:
-                with open(local_path, mode="rb") as source_fp:
+                with open(
+                    local_path, mode="rb", buffering=UPLOAD_BUFFER_SIZE
+                ) as source_fp:
                     self.api.files_response(
                         "PUT",
                         path=shorter_path,
@@ -446,3 +515,32 @@ class Storage:
                 return OperationResponse(False, timer.duration)
             else:
                 return OperationResponse(True, timer.duration)
+
+    def delete_files(
+        self, nodes: Iterable[FileNode]
+    ) -> Generator[Tuple[FileNode, OperationResponse], None, None]:
+        """
+        Delete the files represented by the given `nodes` from the printer.
+
+        Each deletion is a separate, latency-bound request, so up to
+        `REQUEST_WORKERS` of them are made concurrently.
+
+        Parameters
+        ----------
+        nodes : iterable of FileNode
+            The nodes that represent the remote files to delete.
+
+        Yields
+        ------
+        tuple of FileNode and OperationResponse
+            Each node, with the result of its deletion, as each completes.
+        """
+        with ThreadPoolExecutor(
+            max_workers=REQUEST_WORKERS,
+            thread_name_prefix=f"link-sync-{self.name}",
+        ) as pool:
+            futures = {
+                pool.submit(self.delete_file, node): node for node in nodes
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
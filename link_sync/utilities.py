@@ -1,9 +1,49 @@
 from datetime import datetime, timedelta
 from functools import lru_cache
-import math
+import os
 from pathlib import Path
 from string import Formatter
-from typing import Generator, Iterable, Optional, Union
+import time
+from typing import (
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+def _gen_file_entries(
+    local_path: Union[Path, str], suffixes: Optional[FrozenSet[str]]
+) -> Generator[os.DirEntry, None, None]:
+    """
+    Yield non-hidden file entries, descending through sub-directories.
+
+    This uses `os.scandir()` so that the file-type checks are served from the
+    directory listing itself rather than requiring a `stat()` per entry, and
+    an explicit stack of directories rather than recursion. Directories that
+    cannot be read (e.g., `lost+found`) are skipped.
+    """
+    directories = [os.fspath(local_path)]
+    while directories:
+        try:
+            scandir_it = os.scandir(directories.pop())
+        except PermissionError:
+            continue
+        with scandir_it as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_file():
+                    if (
+                        not suffixes
+                        or os.path.splitext(entry.name)[1] in suffixes
+                    ):
+                        yield entry
+                elif entry.is_dir():
+                    directories.append(entry.path)
 
 
 def gen_files_from_path(
@@ -28,26 +68,72 @@ def gen_files_from_path(
     Path
         A file found within the given `local_path`.
     """
-    for path_obj in local_path.glob("*"):
-        if (
-            path_obj.is_file()
-            and not path_obj.name.startswith(".")
-            and (not suffixes or path_obj.suffix in suffixes)
-        ):
-            yield path_obj
-        elif path_obj.is_dir() and not path_obj.name.startswith("."):
-            yield from gen_files_from_path(path_obj, suffixes=suffixes)
-
-
-@lru_cache(maxsize=1000)
-def get_file_mtime(local_file: Path) -> datetime:
+    suffix_set = frozenset(suffixes) if suffixes else None
+    for entry in _gen_file_entries(local_path, suffix_set):
+        yield Path(entry.path)
+
+
+def gen_files_and_mtimes_from_path(
+    local_path: Path, suffixes: Optional[Iterable[str]] = None
+) -> Generator[Tuple[Path, float], None, None]:
+    """
+    Yield filenames and their modification times from the given `local_path`.
+
+    This behaves as `gen_files_from_path()` but also yields each file's
+    `st_mtime` from the same directory scan.
+
+    Parameters
+    ----------
+    local_path : Path
+        The path from which to start looking inside of.
+    suffixes : Iterable of str or None, default None
+        Optional. If provided, the files returned must have a suffix contained
+        in `suffixes`. If not provided, all file objects (except hidden ones)
+        will be returned.
+
+    Yields
+    ------
+    tuple of Path and float
+        A file found within the given `local_path` and its modification time
+        in seconds since the Epoch.
+    """
+    suffix_set = frozenset(suffixes) if suffixes else None
+    for entry in _gen_file_entries(local_path, suffix_set):
+        yield Path(entry.path), entry.stat().st_mtime
+
+
+# Cached modification times, as `{path: (cached_at, mtime)}`.
+_MTIME_CACHE: Dict[str, Tuple[float, datetime]] = {}
+
+# How long, in seconds, a cached modification time remains valid.
+MTIME_CACHE_TTL = 2.0
+
+
+def get_file_mtime(
+    local_file: Path, stat_result: Optional[os.stat_result] = None
+) -> datetime:
     """
     Return the modification time-stamp for the given file as a datetime in UTC.
 
     This is cached so that we're not hitting the filesystem N times per file
-    where N is the number of idle printers.
+    where N is the number of idle printers. Cached values expire after
+    `MTIME_CACHE_TTL` seconds so that changes to the file are picked up.
+
+    Callers that have already stat'ed the file (e.g., from a directory scan)
+    may pass that `stat_result` to avoid another `stat()` call; it is used
+    as-is and refreshes the cached value.
     """
-    return datetime.fromtimestamp(local_file.stat().st_mtime)
+    key = os.fspath(local_file)
+    now = time.monotonic()
+    if stat_result is None:
+        if cached := _MTIME_CACHE.get(key):
+            cached_at, mtime = cached
+            if now - cached_at < MTIME_CACHE_TTL:
+                return mtime
+        stat_result = os.stat(key)
+    mtime = datetime.fromtimestamp(stat_result.st_mtime)
+    _MTIME_CACHE[key] = (now, mtime)
+    return mtime
 
 
 class Timer:
@@ -85,6 +171,31 @@ class Timer:
         return None
 
 
+# The number of seconds in each of the fields supported by `strfdelta()`, in
+# descending order of size.
+STRFDELTA_CONSTANTS = {
+    "Y": 86400 * 365.24,
+    "m": 86400 * 30.44,
+    "W": 604800,
+    "D": 86400,
+    "H": 3600,
+    "M": 60,
+    "S": 1,
+    "mS": 1 / pow(10, 3),
+    "µS": 1 / pow(10, 6),
+}
+
+
+@lru_cache(maxsize=32)
+def _parse_strfdelta_fields(fmt: str) -> FrozenSet[str]:
+    """Return the set of field names used in the format string `fmt`."""
+    return frozenset(
+        field_tuple[1]
+        for field_tuple in Formatter().parse(fmt)
+        if field_tuple[1] is not None
+    )
+
+
 def strfdelta(delta: timedelta, fmt: str = "{H:01}h {M:01}m {S:01.1f}s"):
     """
     Format a timedelta instance to string.
@@ -101,24 +212,11 @@ def strfdelta(delta: timedelta, fmt: str = "{H:01}h {M:01}m {S:01.1f}s"):
     # Convert timedelta to float seconds.
     remainder = delta.total_seconds()
 
-    f = Formatter()
-    desired_fields = [field_tuple[1] for field_tuple in f.parse(fmt)]
-    possible_fields = ("Y", "m", "W", "D", "H", "M", "S", "mS", "µS")
-    constants = {
-        "Y": 86400 * 365.24,
-        "m": 86400 * 30.44,
-        "W": 604800,
-        "D": 86400,
-        "H": 3600,
-        "M": 60,
-        "S": 1,
-        "mS": 1 / pow(10, 3),
-        "µS": 1 / pow(10, 6),
-    }
+    desired_fields = _parse_strfdelta_fields(fmt)
     values = {}
-    for field in possible_fields:
-        if field in desired_fields and field in constants:
-            Quotient, remainder = divmod(remainder, constants[field])
+    for field, constant in STRFDELTA_CONSTANTS.items():
+        if field in desired_fields:
+            Quotient, remainder = divmod(remainder, constant)
             if (
                 field == "S"
                 and "mS" not in desired_fields
@@ -127,24 +225,26 @@ def strfdelta(delta: timedelta, fmt: str = "{H:01}h {M:01}m {S:01.1f}s"):
                 values[field] = Quotient + remainder
             else:
                 values[field] = int(Quotient)
-    return f.format(fmt, **values)
+    return fmt.format(**values)
+
+
+# Binary unit prefixes, indexed by magnitude (in multiples of 1024).
+TRANSFER_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
 
 
 def human_readable_transfer_speed(bytes: int, duration: float) -> str:
     """Return the transfer speed in human readable binary units."""
-    UNITS = "KMGTP"
-
     if bytes and duration:
         raw_speed = bytes / duration
-        magnitude = math.floor(math.log(raw_speed, 1024))
-        # magnitude = math.floor(math.pow(raw_speed, 1 / 1024))
-        if magnitude == 0:
-            return f"{raw_speed:,.1f} B/sec."
-        else:
-            return (
-                f"{raw_speed / math.pow(1024, magnitude):,.1f} "
-                f"{UNITS[magnitude - 1]}B/sec."
-            )
+        # Each binary magnitude is 10 bits wide.
+        magnitude = min(
+            max(0, int(raw_speed).bit_length() - 1) // 10,
+            len(TRANSFER_UNITS) - 1,
+        )
+        return (
+            f"{raw_speed / (1 << (magnitude * 10)):,.1f} "
+            f"{TRANSFER_UNITS[magnitude]}/sec."
+        )
     elif duration:
         return "n/a B/sec."
     else:
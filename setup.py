@@ -1,4 +1,5 @@
 from pathlib import Path
+import re
 from typing import List
 
 from setuptools import setup
@@ -7,23 +8,17 @@ from setuptools import setup
 def get_version(file_path: str, member: str) -> str:
     """Return the version string found in `path` as `member`."""
     path = Path(__file__).parent.joinpath(file_path).absolute()
-    with open(path, 'r') as fp:
-        for line in fp:
-            if line.startswith(member):
-                return line.split('=')[1].strip(' \'\t\n"')
+    pattern = rf'^{re.escape(member)}\s*=\s*[\'"]([^\'"]+)[\'"]'
+    if match := re.search(pattern, path.read_text(), re.MULTILINE):
+        return match.group(1)
     return ''
 
 
 def get_requirements(file_path: str) -> List[str]:
     """Return the list of requirements found in `path`."""
     path = Path(__file__).parent.joinpath(file_path).absolute()
-    requirements = []
-    with open(path, 'r') as fp:
-        for line in fp:
-            line = line.strip(' \t\n')
-            if not line.startswith('#'):
-                requirements.append(line)
-    return requirements
+    lines = (line.strip() for line in path.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith('#')]
 
 
 setup(
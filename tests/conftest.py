@@ -4,12 +4,19 @@ from pathlib import Path
 from link_sync.apis import PrusaLinkApi
 from link_sync.printers import Printer, State
 from link_sync.storage import FileNode, Storage
+from link_sync.utilities import gen_files_from_path
 import pytest
 
 
 DATA = Path(__file__).parent.joinpath('data')
 
 
+@pytest.fixture(scope="session")
+def file_hierarchy_paths():
+    """Walk the data/file_hierarchy tree once for the whole session."""
+    return tuple(gen_files_from_path(DATA.joinpath('file_hierarchy')))
+
+
 @pytest.fixture()
 def root_node():
     """Prepare a child FileNode instance."""
@@ -34,7 +41,7 @@ def child_node(root_node):
         ro=False,
         type="PRINT_FILE",
     )
-    root_node.child_nodes = [child_node, ]
+    root_node.child_nodes = {child_node.name: child_node}
     return child_node
 
 
@@ -1,7 +1,9 @@
 from http import HTTPStatus
 from pathlib import Path
 
+from link_sync.apis import POOL_CONNECTIONS, POOL_MAXSIZE
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPDigestAuth
 
 
@@ -17,6 +19,13 @@ def test_session(api):
     """Test that PrusaLinkApi.session works as expected."""
     assert isinstance(api.session, Session)
 
+    for prefix in ('http://', 'https://'):
+        adapter = api.session.get_adapter(f'{prefix}0.0.0.0')
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_connections == POOL_CONNECTIONS
+        assert adapter._pool_maxsize == POOL_MAXSIZE
+        assert adapter.max_retries.total == 3
+
 
 def test_status_response_ok(mocker, api, mock_status_response):
     """Test that PrusaLink.status_response() works as expected."""
@@ -53,6 +62,17 @@ def test_files_response_put_file_ok(mocker, api, mock_files_put_response):
     mock_files_put_response.status_code = HTTPStatus.OK
     mocker.patch('requests.Session.request',
                  return_value=mock_files_put_response)
-    with open(DATA.joinpath('file_hierarchy', 'other.gcode')) as fp:
+    with open(DATA.joinpath('file_hierarchy', 'other.gcode'), 'rb') as fp:
         payload = api.files_response(method='PUT', path='usb', data=fp)
         assert payload
+
+
+def test_session_is_cached(api):
+    """Test that PrusaLinkApi.session returns the same instance each time."""
+    assert api.session is api.session
+    assert api.session.headers['Connection'] == 'keep-alive'
+
+
+def test_auth_is_cached(api):
+    """Test that PrusaLinkApi.auth returns the same instance each time."""
+    assert api.auth is api.auth
@@ -10,7 +10,6 @@ from link_sync.printers import (
     State,
 )
 from link_sync.storage import FileNode, Storage
-from link_sync.utilities import gen_files_from_path
 import pytest
 
 
@@ -81,8 +80,8 @@ def test_get_status_not_found(mocker, root_node):
 def test_full_short_path(storage, root_node, child_node):
     """Test that full_short_path works as expected."""
     assert storage.root_node.full_short_path == f'/{root_node.name}'
-    root_node.child_nodes = {child_node, }
-    children = list(storage.root_node.child_nodes)
+    root_node.child_nodes = {child_node.name: child_node}
+    children = list(storage.root_node.child_nodes.values())
     assert children
     child = children[0]
     assert child.full_short_path == f'/{root_node.name}/{child.name}'
@@ -91,20 +90,20 @@ def test_full_short_path(storage, root_node, child_node):
 def test_full_display_path(storage, root_node, child_node):
     """Test that full_display_path works as expected."""
     assert storage.root_node.full_display_path == f'/{root_node.display_name}'
-    root_node.child_nodes = {child_node, }
-    children = list(storage.root_node.child_nodes)
+    root_node.child_nodes = {child_node.name: child_node}
+    children = list(storage.root_node.child_nodes.values())
     assert children
     child = children[0]
     assert child.full_display_path == (
         f'/{root_node.display_name}/{child.display_name}')
 
 
-def test_gen_missing_or_stale_files(printers):
+def test_gen_missing_or_stale_files(printers, file_hierarchy_paths):
     """Test that gen_missing_or_stale_files works as expected."""
     printer: Printer = printers[0]
     assert printer.storage.root_node
     local_file_path = DATA.joinpath('file_hierarchy')
-    local_files = gen_files_from_path(local_file_path)
+    local_files = iter(file_hierarchy_paths)
     files = printer.gen_missing_or_stale_files(
         local_files=local_files,
         relative_to_path=local_file_path,
@@ -116,7 +115,7 @@ def test_gen_missing_or_stale_files(printers):
     assert isinstance(files[0], MissingOrStaleFile)
 
 
-def test_get_excess_files(printers):
+def test_get_excess_files(printers, file_hierarchy_paths):
     """Test that get_excess_files works as intended."""
     printer: Printer = printers[0]
     assert printer.storage.root_node
@@ -130,28 +129,29 @@ def test_get_excess_files(printers):
                      parent_node=printer.storage.root_node)
     a_gcode = FileNode(name='A~1.GCO', display_name='a.gcode', ro=False,
                        type="PRINT_FILE", parent_node=a_dir)
-    a_dir.child_nodes.add(a_gcode)
+    a_dir.child_nodes[a_gcode.name] = a_gcode
 
     # Also, create some nodes that do NOT match the file_hierarchy.
     another_gcode = FileNode(name='ANOTHE~1.GCO', display_name='another.gcode',
                              ro=False, type="PRINT_FILE", parent_node=a_dir)
-    a_dir.child_nodes.add(another_gcode)
+    a_dir.child_nodes[another_gcode.name] = another_gcode
 
     # "c/" does not exist in the file_hierarchy at all.
     c_dir = FileNode(name='c', type="FOLDER", ro=False,
                      parent_node=printer.storage.root_node)
     c_gcode = FileNode(name='A~1.GCO', display_name='a.gcode', ro=False,
                        type="PRINT_FILE", parent_node=c_dir)
-    c_dir.child_nodes.add(c_gcode)
+    c_dir.child_nodes[c_gcode.name] = c_gcode
     canother_gcode = FileNode(name="CANOTH~1", display_name="canother.gcode",
                               ro=False, type="PRINT_FILE", parent_node=c_dir)
-    c_dir.child_nodes.add(canother_gcode)
+    c_dir.child_nodes[canother_gcode.name] = canother_gcode
 
     # Attach these to the printer's storage file_hierarchy
-    printer.storage.root_node.child_nodes.add(a_dir)
-    printer.storage.root_node.child_nodes.add(c_dir)
+    printer.storage.root_node.child_nodes[a_dir.name] = a_dir
+    printer.storage.root_node.child_nodes[c_dir.name] = c_dir
 
-    local_files = list(gen_files_from_path(local_files_path))
+    local_files = [path for path in file_hierarchy_paths
+                   if local_files_path in path.parents]
     excess_files = printer.get_excess_files(
         local_files=local_files,
         relative_to_path=local_files_path,
@@ -160,3 +160,58 @@ def test_get_excess_files(printers):
 
     assert isinstance(excess_files, set)
     assert len(excess_files) == 3
+
+
+def test_gen_missing_or_stale_files_with_local_mtimes(printers):
+    """Test that gen_missing_or_stale_files uses the given local_mtimes."""
+    printer: Printer = printers[0]
+    local_file_path = DATA.joinpath('file_hierarchy')
+    local_file = local_file_path.joinpath('other.gcode')
+    remote_node = FileNode(name='OTHER~1.GCO', display_name='other.gcode',
+                           ro=False, type="PRINT_FILE",
+                           m_timestamp=1690000000,
+                           parent_node=printer.storage.root_node)
+    printer.storage.root_node.child_nodes[remote_node.name] = remote_node
+
+    def gen_files(local_mtime):
+        return list(printer.gen_missing_or_stale_files(
+            local_files=[local_file],
+            relative_to_path=local_file_path,
+            destination_path=Path('/usb/'),
+            local_mtimes={local_file: local_mtime},
+        ))
+
+    # Within the staleness threshold, nothing to do.
+    assert gen_files(1690000000 + 30) == []
+
+    # Beyond it, the file is stale.
+    files = gen_files(1690000000 + 120)
+    assert len(files) == 1
+    assert files[0].is_stale is True
+
+
+def test_get_excess_files_ignores_sibling_folders(printers):
+    """Test that get_excess_files only considers the destination subtree."""
+    printer: Printer = printers[0]
+    root_node = printer.storage.root_node
+
+    # "/usb/ab" shares the short-path prefix of "/usb/a" but is a sibling.
+    a_dir = FileNode(name='A', display_name='a', type="FOLDER", ro=False,
+                     parent_node=root_node)
+    ab_dir = FileNode(name='AB', display_name='ab', type="FOLDER", ro=False,
+                      parent_node=root_node)
+    a_gcode = FileNode(name='EXCESS~1.GCO', display_name='excess.gcode',
+                       ro=False, type="PRINT_FILE", parent_node=a_dir)
+    ab_gcode = FileNode(name='OTHER~1.GCO', display_name='other.gcode',
+                        ro=False, type="PRINT_FILE", parent_node=ab_dir)
+    a_dir.child_nodes[a_gcode.name] = a_gcode
+    ab_dir.child_nodes[ab_gcode.name] = ab_gcode
+    root_node.child_nodes[a_dir.name] = a_dir
+    root_node.child_nodes[ab_dir.name] = ab_dir
+
+    excess_files = printer.get_excess_files(
+        local_files=[],
+        relative_to_path=DATA,
+        destination_path=Path('/usb/a'),
+    )
+    assert excess_files == {Path('/usb/a/excess.gcode')}
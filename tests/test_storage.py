@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from http import HTTPStatus
 from pathlib import Path
 from typing import Generator
@@ -18,6 +18,11 @@ def test_file_node_repr(root_node):
     assert repr(root_node) == '<File: "usb">'
 
 
+def test_file_node_is_slotted(root_node):
+    """Test that FileNode instances do not carry a __dict__."""
+    assert not hasattr(root_node, '__dict__')
+
+
 def test_file_node_is_dir_yes(root_node):
     """Tests that is_dir returns True when expected."""
     assert root_node.is_dir is True
@@ -31,6 +36,8 @@ def test_file_node_is_dir_no(child_node):
 def test_file_node_m_datetime(child_node):
     """Test that m_datetime works as expected."""
     assert isinstance(child_node.m_datetime, datetime)
+    assert child_node.m_datetime == datetime(
+        2023, 7, 22, 4, 26, 40, tzinfo=timezone.utc)
 
 
 def test_file_node_m_datetime_for_none(child_node):
@@ -75,18 +82,31 @@ def test_get_root_node_not_ok(mocker):
 
 def test_gen_nodes(storage, child_node):
     """Test that gen_nodes works as expected."""
-    if child_node not in storage.root_node.child_nodes:
-        storage.root_node.child_nodes.add(child_node)
+    if child_node.name not in storage.root_node.child_nodes:
+        storage.root_node.child_nodes[child_node.name] = child_node
     nodes = storage.gen_nodes()
     assert isinstance(nodes, Generator)
     nodes = list(nodes)
     assert len(nodes) == 2
 
 
+def test_gen_nodes_order(storage, root_node):
+    """Test that gen_nodes yields the nodes depth-first, in order."""
+    a_dir = FileNode(name='A', type="FOLDER", ro=False, parent_node=root_node)
+    b_dir = FileNode(name='B', type="FOLDER", ro=False, parent_node=root_node)
+    a_gcode = FileNode(name='A.GCO', type="PRINT_FILE", ro=False,
+                       parent_node=a_dir)
+    a_dir.child_nodes[a_gcode.name] = a_gcode
+    root_node.child_nodes = {a_dir.name: a_dir, b_dir.name: b_dir}
+
+    assert list(storage.gen_nodes()) == [root_node, a_dir, a_gcode, b_dir]
+    assert list(storage.gen_nodes(a_dir)) == [a_dir, a_gcode]
+
+
 def test_get_node_for_display_path(storage, child_node):
     """Test that get_node_for_path works as expected."""
-    if child_node not in storage.root_node.child_nodes:
-        storage.root_node.child_nodes.add(child_node)
+    if child_node.name not in storage.root_node.child_nodes:
+        storage.root_node.child_nodes[child_node.name] = child_node
     path_str = '/usb/Benchy.gcode'
     path = Path(path_str)
 
@@ -103,6 +123,24 @@ def test_get_node_for_display_path(storage, child_node):
     assert node is None
 
 
+def test_get_node_for_short_path(storage, child_node):
+    """Test that get_node_for_short_path works as expected."""
+    if child_node.name not in storage.root_node.child_nodes:
+        storage.root_node.child_nodes[child_node.name] = child_node
+
+    # Ensure it works for string paths...
+    node = storage.get_node_for_short_path('/USB/BENCHY.GCO')
+    assert node == child_node
+
+    # And for Path paths...
+    node = storage.get_node_for_short_path(Path('/USB/BENCHY.GCO'))
+    assert node == child_node
+
+    # And for non-existent paths...
+    node = storage.get_node_for_short_path('/USB/DOES_N~1.ZIP')
+    assert node is None
+
+
 def test_get_shorter_path(storage):
     """Test that get_shorter_path works as expected."""
     dir_node = FileNode(
@@ -122,8 +160,8 @@ def test_get_shorter_path(storage):
         type="FOLDER",
     )
     # Ensure dir_node is part of the tree
-    dir_node.child_nodes.add(dir_node2)
-    storage.root_node.child_nodes.add(dir_node)
+    dir_node.child_nodes[dir_node2.name] = dir_node2
+    storage.root_node.child_nodes[dir_node.name] = dir_node
 
     # Test wuth string input
     path_str = '/usb/long and complicated path/another complicated path/NotBenchy.gcode'  # noqa
@@ -142,3 +180,110 @@ def test_get_shorter_path(storage):
     # Test with all new directory and file
     shorter_path = storage.get_shorter_path('/brand new path/new_benchy.gcode')  # noqa
     assert shorter_path == Path('/brand new path/new_benchy.gcode')
+
+
+def test_upload_file_creates_new_folder_once(mocker, storage):
+    """Test that upload_file only requests creation of a new folder once."""
+    files_response = mocker.patch.object(
+        PrusaLinkApi, 'files_response',
+        return_value=ApiResponse(HTTPStatus.CREATED))
+    local_path = Path(__file__).parent.joinpath(
+        'data', 'file_hierarchy', 'other.gcode')
+    for name in ('one.gcode', 'two.gcode'):
+        response = storage.upload_file(local_path, f'/usb/new/{name}')
+        assert response.success
+
+    create_calls = [
+        call for call in files_response.call_args_list
+        if 'Create-Folder' in (call.kwargs.get('headers') or {})
+    ]
+    assert len(create_calls) == 1
+    assert files_response.call_count == 3
+
+
+def test_get_node_for_display_path_after_reload(storage, child_node):
+    """Test that get_node_for_display_path does not use a stale index."""
+    if child_node.name not in storage.root_node.child_nodes:
+        storage.root_node.child_nodes[child_node.name] = child_node
+    assert storage.get_node_for_display_path('/usb/Benchy.gcode') == child_node
+
+    storage.reload()
+    assert storage.get_node_for_display_path('/usb/Benchy.gcode') is None
+
+
+def test_build_storage(mocker, root_node):
+    """Test that _build_storage fetches and links every folder."""
+    listings = {
+        '/USB': [
+            {'name': 'BENCHY.GCO', 'display_name': 'benchy.gcode',
+             'type': 'PRINT_FILE', 'ro': False},
+            {'name': 'A', 'display_name': 'a', 'type': 'FOLDER', 'ro': False},
+            {'name': 'B', 'display_name': 'b', 'type': 'FOLDER', 'ro': False},
+        ],
+        '/USB/A': [
+            {'name': 'AB', 'display_name': 'ab', 'type': 'FOLDER',
+             'ro': False},
+        ],
+        '/USB/A/AB': [
+            {'name': 'AB~1.GCO', 'display_name': 'ab.gcode',
+             'type': 'PRINT_FILE', 'ro': False},
+        ],
+    }
+
+    def files_response(method='GET', *, path, **kwargs):
+        children = listings.get(path)
+        if children is None:
+            return ApiResponse(HTTPStatus.NOT_FOUND)
+        return ApiResponse(HTTPStatus.OK, {'children': children})
+
+    mocker.patch.object(Storage, '_get_root_node', return_value=root_node)
+    mocker.patch.object(PrusaLinkApi, 'files_response',
+                        side_effect=files_response)
+    storage = Storage(name='fake', host='http://127.0.0.1',
+                      username='maker', password='fake_pw')
+
+    assert {node.full_display_path for node in storage.gen_nodes()} == {
+        '/usb',
+        '/usb/benchy.gcode',
+        '/usb/a',
+        '/usb/b',
+        '/usb/a/ab',
+        '/usb/a/ab/ab.gcode',
+    }
+
+
+def test_upload_file_headers(mocker, storage):
+    """Test that upload_file sends the expected headers."""
+    files_response = mocker.patch.object(
+        PrusaLinkApi, 'files_response',
+        return_value=ApiResponse(HTTPStatus.CREATED))
+    local_path = Path(__file__).parent.joinpath(
+        'data', 'file_hierarchy', 'other.gcode')
+    assert storage.upload_file(local_path, '/usb/other.gcode').success
+
+    headers = files_response.call_args.kwargs['headers']
+    assert headers == {
+        'Overwrite': 'true',
+        'Print-After-Upload': 'false',
+        'X-Api-Key': 'fake_pw',
+        'Content-type': 'text/x.gcode',
+    }
+
+
+def test_delete_files(mocker, storage, root_node):
+    """Test that delete_files deletes every node given."""
+    files_response = mocker.patch.object(
+        PrusaLinkApi, 'files_response',
+        return_value=ApiResponse(HTTPStatus.NO_CONTENT))
+    nodes = [
+        FileNode(name=f'FILE{i}.GCO', type="PRINT_FILE", ro=False,
+                 parent_node=root_node)
+        for i in range(10)
+    ]
+    results = dict(storage.delete_files(nodes))
+
+    assert set(results) == set(nodes)
+    assert all(response.success for response in results.values())
+    assert {call.kwargs['path'] for call in files_response.call_args_list} == {
+        node.full_short_path for node in nodes
+    }
@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
+import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Iterator
 
 from link_sync.utilities import (
+    gen_files_and_mtimes_from_path,
     gen_files_from_path,
     get_file_mtime,
     human_readable_transfer_speed,
@@ -48,6 +50,39 @@ def test_gen_files_from_path(suffixes, num_files):
             assert path.suffix in suffixes
 
 
+def test_gen_files_from_path_skips_unreadable_directories(mocker):
+    """Test that gen_files_from_path skips directories it cannot read."""
+    file_hierarchy = Path(Path(__file__).parent, "data", "file_hierarchy")
+    unreadable = os.fspath(file_hierarchy.joinpath("usb", "a"))
+    scandir = os.scandir
+
+    def fake_scandir(path):
+        if path == unreadable:
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    mocker.patch("link_sync.utilities.os.scandir", side_effect=fake_scandir)
+    paths = list(gen_files_from_path(file_hierarchy))
+
+    assert len(paths) == 4
+    for path in paths:
+        assert Path(unreadable) not in path.parents
+
+
+def test_gen_files_and_mtimes_from_path():
+    """Test that gen_files_and_mtimes_from_path works as expected."""
+    file_hierarchy = Path(Path(__file__).parent, "data", "file_hierarchy")
+    pairs = gen_files_and_mtimes_from_path(file_hierarchy, suffixes={".gcode"})
+
+    assert isinstance(pairs, Iterator)
+
+    pairs = list(pairs)
+    assert len(pairs) == 4
+    for path, mtime in pairs:
+        assert path.suffix == ".gcode"
+        assert mtime == path.stat().st_mtime
+
+
 def test_get_file_mtime():
     """Test that get_file_mtime works as expected."""
     with TemporaryDirectory() as temp_dir:
@@ -57,6 +92,41 @@ def test_get_file_mtime():
         assert int(m_time.timestamp()) == int(datetime.now().timestamp())
 
 
+def test_get_file_mtime_expires(monkeypatch):
+    """Test that get_file_mtime picks up changes once the cache expires."""
+    with TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir, "tmp.txt")
+        path.touch(exist_ok=True)
+        os.utime(path, (1690000000, 1690000000))
+        assert get_file_mtime(path) == datetime.fromtimestamp(1690000000)
+
+        # Within the TTL, the cached value is returned.
+        os.utime(path, (1700000000, 1700000000))
+        assert get_file_mtime(path) == datetime.fromtimestamp(1690000000)
+
+        # Once expired, the file is stat()'d again.
+        monkeypatch.setattr("link_sync.utilities.MTIME_CACHE_TTL", 0)
+        assert get_file_mtime(path) == datetime.fromtimestamp(1700000000)
+
+
+def test_get_file_mtime_with_stat_result(mocker):
+    """Test that get_file_mtime uses a given stat_result without stat()."""
+    with TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir, "tmp.txt")
+        path.touch(exist_ok=True)
+        os.utime(path, (1690000000, 1690000000))
+        stat_result = path.stat()
+
+        mock_stat = mocker.patch("link_sync.utilities.os.stat")
+        m_time = get_file_mtime(path, stat_result)
+        assert m_time == datetime.fromtimestamp(1690000000)
+        mock_stat.assert_not_called()
+
+        # The given stat_result also refreshes the cached value.
+        assert get_file_mtime(path) == m_time
+        mock_stat.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "bytes, duration, expected_result",
     [
@@ -72,6 +142,9 @@ def test_get_file_mtime():
         (30_000_000, 1.0, "28.6 MB/sec."),
         (400_000_000, 1.0, "381.5 MB/sec."),
         (5_000_000_000, 1.0, "4.7 GB/sec."),
+        (1, 2.0, "0.5 B/sec."),
+        (1024, 1.0, "1.0 KB/sec."),
+        (1023, 1.0, "1,023.0 B/sec."),
     ],
 )
 def test_human_readable_transfer_speed(bytes, duration, expected_result):